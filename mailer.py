@@ -16,17 +16,33 @@ Funktionen:
 """
 
 import argparse
+import datetime
+import functools
+import io
+import itertools
 import os
 import re
+import stat
 import sys
+import tempfile
+import threading
 import time
 import glob
 import pathlib
-from typing import Dict, List, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from openpyxl import load_workbook
 import win32com.client as win32
-from jinja2 import Template
+from jinja2 import (
+    Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound, meta, select_autoescape,
+)
+from markupsafe import Markup
+
+try:
+    from python_calamine import CalamineWorkbook  # optional: schneller Excel-Reader
+except ImportError:
+    CalamineWorkbook = None
 
 
 # ------------------------ Pfad-Utilities (EXE/Skript-sicher) ------------------------
@@ -44,6 +60,16 @@ def get_base_dir() -> pathlib.Path:
 
 BASE_DIR = get_base_dir()
 
+# Einmalig kompilierte Muster (werden pro Kontakt verwendet)
+_SIG_RE = re.compile(r"<!--signature-->", re.I)
+_LIST_TRANS = str.maketrans({";": ","})
+
+# Spalten, die main() unabhängig vom Template selbst auswertet
+_CONTACT_COLUMNS: FrozenSet[str] = frozenset({
+    "email", "betreff", "anrede", "vorname", "nachname", "firma", "titel",
+    "cc", "bcc", "anhangpfad", "anhang",
+})
+
 
 def resolve_path(p: Optional[str], default_name: str) -> pathlib.Path:
     """
@@ -65,63 +91,157 @@ def normalize(s: Optional[str]) -> str:
     return (s or "").strip()
 
 
+def _cellstr(v) -> str:
+    """Zellwert → str; nur echte Strings werden getrimmt (Zahlen/Datumswerte direkt via str())."""
+    return "" if v is None else v.strip() if type(v) is str else str(v)
+
+
+_FILE_CHECK_CACHE: Dict[str, bool] = {}
+
+
+def _is_file(path: str) -> bool:
+    """
+    Reguläre Datei? Ein stat()-Aufruf statt exists()+is_file(); Ergebnis wird je Pfad
+    gemerkt, da dieselben Anhänge (z. B. Prospekt.pdf) oft für viele Kontakte vorkommen.
+    """
+    hit = _FILE_CHECK_CACHE.get(path)
+    if hit is None:
+        try:
+            hit = stat.S_ISREG(os.stat(path).st_mode)
+        except OSError:
+            hit = False
+        _FILE_CHECK_CACHE[path] = hit
+    return hit
+
+
 def read_subject(arg: Optional[str]) -> str:
     """Wenn arg eine Datei ist, deren Inhalt verwenden; sonst Text selbst."""
     if not arg:
         return ""
-    p = pathlib.Path(arg)
-    if p.exists() and p.is_file():
-        return p.read_text(encoding="utf-8").strip()
+    if _is_file(arg):
+        return pathlib.Path(arg).read_text(encoding="utf-8").strip()
     return arg.strip()
 
 
+_ANREDE = {"herr": ("Sehr geehrter", "Herr"), "frau": ("Sehr geehrte", "Frau")}
+
+
 def build_anrede_brief(anrede: str, titel: str, vorname: str, nachname: str) -> str:
-    a = normalize(anrede).lower()
-    t = normalize(titel)
     ln = normalize(nachname)
-    fn = " ".join(x for x in [normalize(vorname), normalize(nachname)] if x).strip()
-
-    def pick(fb: str) -> str:
-        if not t:
-            return fb
-        lower = t.lower()
-        if lower.startswith("herr") or lower.startswith("frau"):
-            return t  # Titel enthält bereits Anrede-Schlüsselwort → nicht doppeln
-        return f"{fb} {t}"
-
-    if a == "herr":
-        return f"Sehr geehrter {pick('Herr')} {ln or fn}".strip()
-    if a == "frau":
-        return f"Sehr geehrte {pick('Frau')} {ln or fn}".strip()
-    return f"Guten Tag {fn}" if fn else "Guten Tag"
-
-
-def load_contacts(xlsx_path: str, sheet: Optional[str]) -> List[Dict[str, str]]:
-    """Liest Excel; normalisiert Header zu lowercase; liefert nur Zeilen mit 'email'."""
-    wb = load_workbook(xlsx_path, data_only=True)
-    if sheet:
-        if sheet not in wb.sheetnames:
-            raise SystemExit(f"Tabellenblatt '{sheet}' nicht gefunden (vorhanden: {wb.sheetnames})")
-        ws = wb[sheet]
+    vn = normalize(vorname)
+    fn = f"{vn} {ln}" if vn and ln else (vn or ln)
+
+    entry = _ANREDE.get(normalize(anrede).lower())
+    if entry is None:
+        return f"Guten Tag {fn}" if fn else "Guten Tag"
+    greeting, fb = entry
+
+    t = normalize(titel)
+    if not t:
+        head = fb
+    elif t.lower().startswith(("herr", "frau")):
+        head = t  # Titel enthält bereits Anrede-Schlüsselwort → nicht doppeln
     else:
-        ws = wb[wb.sheetnames[0]]  # erstes Blatt
+        head = f"{fb} {t}"
+    return f"{greeting} {head} {ln or fn}".strip()
 
-    rows = list(ws.iter_rows(values_only=True))
-    if len(rows) < 2:
-        return []
 
-    headers = [normalize(str(h)).lower() for h in rows[0]]
-    data: List[Dict[str, str]] = []
-    for r in rows[1:]:
-        rec = {}
-        for i, v in enumerate(r):
-            key = headers[i] if i < len(headers) else f"spalte_{i+1}"
-            rec[key] = normalize(str(v)) if v is not None else ""
-        if rec.get("email", ""):
-            data.append(rec)
-    return data
+def _calamine_value(v):
+    """
+    Gleicht calamine-Werte an openpyxl an, damit beide Reader dieselben Texte liefern:
+    - calamine liefert jede Zahl als float → ganzzahlige Werte als int (sonst '12345.0')
+    - reine Datumszellen kommen als date, bei openpyxl als datetime
+      ('2025-01-02' vs. '2025-01-02 00:00:00') → auf datetime vereinheitlichen
+    - leere Zellen sind '' statt None (wichtig für leere Header → 'none')
+    """
+    t = type(v)
+    if t is float and v.is_integer():
+        return int(v)
+    if t is datetime.date:
+        return datetime.datetime(v.year, v.month, v.day)
+    if t is str and not v:
+        return None
+    return v
 
 
+def _iter_sheet_rows(xlsx_path: str, sheet: Optional[str]) -> Iterator[Sequence]:
+    """
+    Liefert die Zeilen des Blatts als Wertesequenzen.
+    Bevorzugt python-calamine (Rust-Reader, deutlich schneller/sparsamer),
+    sonst openpyxl im read_only-Modus.
+    """
+    if CalamineWorkbook is not None:
+        wb = CalamineWorkbook.from_path(xlsx_path)
+        if sheet:
+            if sheet not in wb.sheet_names:
+                raise SystemExit(f"Tabellenblatt '{sheet}' nicht gefunden (vorhanden: {wb.sheet_names})")
+            ws = wb.get_sheet_by_name(sheet)
+        else:
+            ws = wb.get_sheet_by_index(0)  # erstes Blatt
+        try:
+            # Hinweis: get_sheet_by_* lädt den Blattbereich bereits komplett (Rust-seitig);
+            # iter_rows spart nur die zusätzliche Python-Liste aller Zeilen (to_python)
+            for row in ws.iter_rows():
+                yield [_calamine_value(v) for v in row]
+        finally:
+            wb.close()
+        return
+
+    from openpyxl import load_workbook
+
+    # read_only: Zellen werden gestreamt statt komplett im Speicher aufgebaut
+    wb = load_workbook(xlsx_path, data_only=True, read_only=True)
+    try:
+        if sheet:
+            if sheet not in wb.sheetnames:
+                raise SystemExit(f"Tabellenblatt '{sheet}' nicht gefunden (vorhanden: {wb.sheetnames})")
+            ws = wb[sheet]
+        else:
+            ws = wb[wb.sheetnames[0]]  # erstes Blatt
+        # Zeilen einzeln ziehen – nie das ganze Blatt als Liste materialisieren
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()  # Zip-Handle freigeben (read_only hält die Datei offen)
+
+
+def load_contacts(
+    xlsx_path: str, sheet: Optional[str], columns: Optional[Set[str]] = None
+) -> Iterator[Dict[str, str]]:
+    """
+    Liest Excel; normalisiert Header zu lowercase; liefert nur Zeilen mit 'email'.
+    Generator: Kontakte werden einzeln geliefert, während der Versand bereits läuft.
+    columns: nur diese (lowercase) Spalten übernehmen; None = alle Spalten.
+    """
+    it = _iter_sheet_rows(xlsx_path, sheet)
+    try:
+        try:
+            header_row = next(it)
+        except StopIteration:
+            return
+
+        headers = [normalize(str(h)).lower() for h in header_row]
+        if "email" not in headers:
+            return
+        email_idx = headers.index("email")
+        # Spaltenpositionen einmalig bestimmen statt pro Zeile alle Zellen abzulegen
+        needed_indices = [(i, h) for i, h in enumerate(headers) if columns is None or h in columns]
+
+        for r in it:
+            # Zeilen ohne E-Mail früh verwerfen, bevor ein Dict gebaut wird
+            if email_idx >= len(r) or not _cellstr(r[email_idx]):
+                continue
+            rec = {h: _cellstr(r[i]) if i < len(r) else "" for i, h in needed_indices}
+            # Zellen ohne Header als spalte_N (auch im Template per {{ spalte_N }} nutzbar)
+            for i in range(len(headers), len(r)):
+                key = f"spalte_{i+1}"
+                if columns is None or key in columns:
+                    rec[key] = _cellstr(r[i])
+            yield rec
+    finally:
+        it.close()
+
+
+@functools.lru_cache(maxsize=1)
 def find_signature_dir() -> pathlib.Path:
     appdata = os.environ.get("APPDATA", "")
     return pathlib.Path(appdata) / "Microsoft" / "Signatures"
@@ -138,35 +258,152 @@ def read_default_signature() -> str:
     sig_dir = find_signature_dir()
     if not sig_dir.exists():
         raise FileNotFoundError(sig_dir)
-    candidates = sorted(sig_dir.glob("*.htm"), key=lambda f: f.stat().st_mtime, reverse=True)
-    if not candidates:
+    # Neueste Signatur in einem Durchlauf bestimmen (kein vollständiges Sortieren)
+    newest = max(sig_dir.glob("*.htm"), key=lambda f: f.stat().st_mtime, default=None)
+    if newest is None:
         raise FileNotFoundError("Keine .htm-Signatur gefunden")
-    return candidates[0].read_text(encoding="utf-8", errors="ignore")
+    return newest.read_text(encoding="utf-8", errors="ignore")
 
 
-def render_html(template_path: str, context: Dict[str, str], signature_html: str = "") -> str:
-    tpl = Template(pathlib.Path(template_path).read_text(encoding="utf-8"))
-    html = tpl.render(**context)
-    if signature_html:
-        if "<!--SIGNATURE-->" in html or "<!--signature-->" in html:
-            html = re.sub(r"<!--signature-->|<!--SIGNATURE-->", signature_html, html, flags=re.I)
-        else:
+JINJA_CACHE_DIR = BASE_DIR / "__jcache__"  # kompilierte Templates über Programmläufe hinweg
+
+# Feste Kontext-Schlüssel (lowercase) – gleichnamige Spalten werden nicht erneut übernommen
+_CTX_RESERVED: FrozenSet[str] = frozenset(
+    {"email", "anrede", "vorname", "nachname", "firma", "titel", "anredebrief"}
+)
+
+RENDER_WORKERS = 4   # Threads für das Vorab-Rendern
+RENDER_AHEAD = 16    # max. Kontakte, die dem Versand vorausgerendert werden
+RENDER_CACHE_SIZE = 256  # gerenderte HTML-Bodies für gleiche Kontext-Werte
+
+
+def make_environment(template_dir: pathlib.Path) -> Environment:
+    """
+    Jinja2-Environment mit FileSystemLoader und Bytecode-Cache:
+    Folgeläufe überspringen Lexer/Parser, solange sich das Template nicht ändert.
+    Ist der Cache-Ordner nicht beschreibbar, wird ohne Cache gearbeitet.
+    """
+    bytecode_cache = None
+    try:
+        JINJA_CACHE_DIR.mkdir(exist_ok=True)
+        # Schreibprobe: ein bereits vorhandener, schreibgeschützter Ordner (z. B. unter
+        # Programme) würde sonst erst in get_template() mit PermissionError scheitern
+        with tempfile.TemporaryFile(dir=str(JINJA_CACHE_DIR)):
+            pass
+        bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
+    except OSError as e:
+        print(f"[WARN] Template-Cache nicht verfügbar: {e}", file=sys.stderr)
+    return Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        bytecode_cache=bytecode_cache,
+        autoescape=select_autoescape(["html", "htm"]),
+    )
+
+
+def load_template(template_path: pathlib.Path) -> Template:
+    """Lädt/kompiliert das Jinja2-Template einmalig (Wiederverwendung für alle Kontakte)."""
+    env = make_environment(template_path.parent)
+    return env.get_template(template_path.name)
+
+
+def template_variables(tpl: Template) -> Tuple[Set[str], bool]:
+    """
+    Liefert (Variablen, vollständig) für Spaltenauswahl/Signatur – inkl. der Variablen
+    aller per include/extends/import eingebundenen Templates. vollständig=False, wenn ein
+    Template dynamisch (über eine Variable) eingebunden wird; dann sind nicht alle bekannt.
+    """
+    env = tpl.environment
+    names: Set[str] = set()
+    todo, seen = [tpl.name], set()
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        try:
+            src, _, _ = env.loader.get_source(env, name)
+        except TemplateNotFound:
+            # optionale Ziele ("ignore missing", Fallback-Listen) dürfen fehlen
+            continue
+        ast = env.parse(src)
+        names |= meta.find_undeclared_variables(ast)
+        for ref in meta.find_referenced_templates(ast):
+            if ref is None:
+                return names, False
+            todo.append(ref)
+    return names, True
+
+
+def render_html(
+    tpl: Template, context: Dict[str, str], signature_html: str = "", inline_signature: bool = False
+) -> str:
+    """
+    inline_signature: Template gibt die Signatur selbst über {{ signature }} aus –
+    dann entfällt die Nachbearbeitung (Marker ersetzen bzw. anhängen) komplett.
+    """
+    if inline_signature:
+        context = dict(context, signature=Markup(signature_html))
+    # Direkt in einen Puffer streamen statt Teilstücke am Ende zu joinen
+    buf = io.StringIO()
+    tpl.stream(**context).dump(buf)
+    html = buf.getvalue()
+    if signature_html and not inline_signature:
+        # Fallback für Templates mit <!--SIGNATURE-->-Marker
+        # subn statt Vorab-Prüfung: nur ein Durchlauf über das HTML
+        html, n = _SIG_RE.subn(lambda _m: signature_html, html)
+        if not n:
             html += "<br>" + signature_html
     return html
 
 
+def build_context(c: Dict[str, str]) -> Dict[str, str]:
+    """Template-Kontext aus einer Kontaktzeile (feste Platzhalter + alle weiteren Spalten)."""
+    ctx = {
+        "Email": c.get("email", ""),
+        "Anrede": c.get("anrede", ""),
+        "Vorname": c.get("vorname", ""),
+        "Nachname": c.get("nachname", ""),
+        "Firma": c.get("firma", ""),
+        "Titel": c.get("titel", ""),
+    }
+    ctx["AnredeBrief"] = build_anrede_brief(
+        ctx["Anrede"], ctx["Titel"], ctx["Vorname"], ctx["Nachname"]
+    )
+
+    # Weitere Spalten ebenfalls bereitstellen (Originalschlüssel in lowercase)
+    for k, v in c.items():
+        if k.lower() not in _CTX_RESERVED:
+            ctx[k] = v
+    return ctx
+
+
+def render_ahead(pool: ThreadPoolExecutor, items: Iterable, fn: Callable, depth: int) -> Iterator[Tuple]:
+    """
+    Liefert (item, future) in Originalreihenfolge; hält bis zu `depth` Aufträge
+    im Pool voraus, damit das Rendern parallel zum (seriellen) COM-Versand läuft.
+    """
+    pending: Deque[Tuple] = deque()
+    for item in items:
+        pending.append((item, pool.submit(fn, item)))
+        if len(pending) > depth:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
 def parse_list_field(val: str) -> List[str]:
     """Teilt CC/BCC/Anhänge über Komma oder Semikolon; trimmt; filtert Leere."""
     if not val:
         return []
-    parts = re.split(r"[;,]", val)
+    # ; auf , abbilden und nativ splitten – kein Regex für zwei Trennzeichen nötig
+    parts = val.translate(_LIST_TRANS).split(",")
     # Anführungszeichen/Whitespace entfernen
     return [p.strip().strip('"').strip("'") for p in parts if p.strip()]
 
 
 # ------------------------ Intelligente Anhangsauflösung ------------------------
 
-def _resolve_attachment_candidates(raw: str, excel_dir: pathlib.Path) -> List[pathlib.Path]:
+def _resolve_attachment_candidates(raw: str, excel_dir: pathlib.Path) -> List[str]:
     """
     Liefert existierende Pfad-Kandidaten:
       - Umgebungsvariablen/ ~ expandieren
@@ -174,50 +411,52 @@ def _resolve_attachment_candidates(raw: str, excel_dir: pathlib.Path) -> List[pa
       - Relativ zu: excel_dir, BASE_DIR, CWD
       - Wildcards (*.pdf) in denselben Basen
       - Nur Dateiname → rekursiv in excel_dir suchen
+    Der häufige Fall (kein Glob) kommt mit os.path-Stringoperationen aus;
+    pathlib nur für Glob/rekursive Suche.
     """
     raw_exp = os.path.expandvars(os.path.expanduser(raw.strip()))
-    p = pathlib.Path(raw_exp)
 
-    bases = [excel_dir, BASE_DIR, pathlib.Path.cwd()]
-    found: List[pathlib.Path] = []
+    bases = [str(excel_dir), str(BASE_DIR), os.getcwd()]
+    found: List[str] = []
 
     has_glob = any(ch in raw_exp for ch in ["*", "?", "["])
 
     # 1) Kein Glob → direkt prüfen
     if not has_glob:
         # absolut?
-        if p.is_absolute() and p.exists():
-            return [p]
+        if os.path.isabs(raw_exp) and _is_file(raw_exp):
+            return [raw_exp]
         # relativ zu Basen?
         for b in bases:
-            cand = (b / p)
-            if cand.exists():
+            cand = os.path.join(b, raw_exp)
+            if _is_file(cand):
                 return [cand]
 
     # 2) Glob → in Basen expandieren
     if has_glob:
         for b in bases:
-            for m in b.glob(raw_exp):
-                if m.exists():
-                    found.append(m)
+            for m in pathlib.Path(b).glob(raw_exp):
+                if _is_file(str(m)):
+                    found.append(str(m))
         if found:
             return found
 
     # 3) Nur Dateiname → rekursiv im Excel-Ordner
+    p = pathlib.Path(raw_exp)
     if p.name and not p.parent:
-        hits = list(excel_dir.rglob(p.name))
+        hits = [str(h) for h in excel_dir.rglob(p.name)]
         if hits:
             return hits
 
     return []
 
 
-def add_attachments(mail, field_value: str, excel_dir: pathlib.Path, warnf=print) -> List[pathlib.Path]:
+def add_attachments(mail, field_value: str, excel_dir: pathlib.Path, warnf=print) -> List[str]:
     """
     Fügt Anhänge hinzu; akzeptiert mehrere Pfade, Wildcards, relative Pfade, Umgebungsvariablen.
     Rückgabe: Liste der tatsächlich angehängten Pfade.
     """
-    added: List[pathlib.Path] = []
+    added: List[str] = []
     for raw in parse_list_field(field_value):
         cands = _resolve_attachment_candidates(raw, excel_dir)
         if not cands:
@@ -225,7 +464,7 @@ def add_attachments(mail, field_value: str, excel_dir: pathlib.Path, warnf=print
             continue
         for path in cands:
             try:
-                mail.Attachments.Add(str(path))
+                mail.Attachments.Add(path)
                 added.append(path)
             except Exception as e:
                 warnf(f"[WARN] Konnte Anhang nicht hinzufügen: {path} ({e})")
@@ -234,7 +473,58 @@ def add_attachments(mail, field_value: str, excel_dir: pathlib.Path, warnf=print
 
 # ------------------------ Outlook-Senden ------------------------
 
+OL_FOLDER_OUTBOX = 4
+
+
+def connect_outlook():
+    """
+    Early-bound Outlook-Objekt über gencache (Property-Zugriffe ohne GetIDsOfNames je Aufruf).
+    Fällt auf spätes Binden zurück, falls der gen_py-Cache nicht erzeugt werden kann.
+    """
+    try:
+        return win32.gencache.EnsureDispatch("Outlook.Application")
+    except Exception as e:
+        print(f"[WARN] gencache nicht verfügbar, nutze Dispatch: {e}", file=sys.stderr)
+        return win32.Dispatch("Outlook.Application")
+
+
+def is_early_bound(com_obj) -> bool:
+    """True, wenn das Objekt aus der gencache-Typbibliothek (win32com.gen_py) stammt."""
+    return type(com_obj).__module__.startswith("win32com.gen_py")
+
+
+def _eprint(msg: str) -> None:
+    print(msg, file=sys.stderr)
+
+
+def wait_for_outbox(outbox, limit: int, pause: float, max_wait: float = 60.0, warnf=_eprint) -> bool:
+    """
+    Drosselung nach Füllstand: Send() legt Mails nur in den Postausgang,
+    daher erst warten, wenn dort mehr als `limit` Mails liegen.
+    Rückgabe: False, wenn die Drosselung für den Rest des Laufs entfallen soll –
+    pause <= 0 (wie bisher -throttle 0), Postausgang nach `max_wait` Sekunden
+    nicht geleert (z. B. Outlook offline) oder nicht abfragbar (COM-Fehler).
+    """
+    if pause <= 0:
+        return False
+    deadline = time.monotonic() + max_wait
+    try:
+        while outbox.Items.Count > limit:
+            if time.monotonic() >= deadline:
+                warnf(
+                    f"[WARN] Postausgang leert sich nicht (>{limit} Mails nach {max_wait:.0f}s) "
+                    f"– Drosselung deaktiviert."
+                )
+                return False
+            time.sleep(pause)
+    except Exception as e:
+        warnf(f"[WARN] Postausgang nicht abfragbar – Drosselung deaktiviert: {e}")
+        return False
+    return True
+
+
 def send_outlook(
+    outlook,
     to_addr: str,
     subject: str,
     html: str,
@@ -243,8 +533,8 @@ def send_outlook(
     attachments: str = "",
     display: bool = False,
     excel_dir: Optional[pathlib.Path] = None,
+    warnf=_eprint,
 ):
-    outlook = win32.Dispatch("Outlook.Application")
     mail = outlook.CreateItem(0)  # olMailItem
     mail.To = to_addr
     if cc:
@@ -255,7 +545,7 @@ def send_outlook(
     mail.HTMLBody = html
 
     if attachments:
-        add_attachments(mail, attachments, excel_dir or pathlib.Path.cwd(), warnf=lambda m: print(m, file=sys.stderr))
+        add_attachments(mail, attachments, excel_dir or pathlib.Path.cwd(), warnf=warnf)
 
     if display:
         mail.Display(False)  # manuell prüfen
@@ -263,6 +553,33 @@ def send_outlook(
         mail.Send()
 
 
+# ------------------------ Fortschrittsausgabe ------------------------
+
+class BufferedLog:
+    """Sammelt Fortschrittszeilen und schreibt sie blockweise statt mit Flush pro Zeile."""
+
+    def __init__(self, stream, every: int = 50):
+        self.stream = stream
+        self.every = every
+        self._buf = io.StringIO()
+        self._count = 0
+
+    def write(self, line: str) -> None:
+        self._buf.write(line + "\n")
+        self._count += 1
+        if self._count >= self.every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._count:
+            return
+        self.stream.write(self._buf.getvalue())
+        self.stream.flush()
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._count = 0
+
+
 # ------------------------ Main ------------------------
 
 def main():
@@ -304,7 +621,13 @@ def main():
         "-throttle",
         type=float,
         default=0.3,
-        help="Pause zwischen Mails (Sekunden), Standard: 0.3",
+        help="Wartezeit (Sekunden), solange der Postausgang voll ist, Standard: 0.3",
+    )
+    parser.add_argument(
+        "-outbox",
+        type=int,
+        default=20,
+        help="Max. Mails im Postausgang, bevor gedrosselt wird, Standard: 20",
     )
     args = parser.parse_args()
 
@@ -326,10 +649,18 @@ def main():
 
     global_subject = read_subject(args.subject) if args.subject else ""
 
-    # Kontakte laden
-    contacts = load_contacts(str(excel_path), args.sheet)
-    if not contacts:
+    # Template nur einmal lesen/kompilieren, nicht pro Kontakt
+    tpl = load_template(template_path)
+
+    # Kontakte laden – nur Spalten, die das Template oder der Versand tatsächlich nutzen
+    tpl_vars, tpl_vars_complete = template_variables(tpl)
+    columns = ({v.lower() for v in tpl_vars} | _CONTACT_COLUMNS) if tpl_vars_complete else None
+    inline_signature = "signature" in tpl_vars
+    contacts = load_contacts(str(excel_path), args.sheet, columns=columns)
+    first = next(contacts, None)
+    if first is None:
         raise SystemExit("Keine Kontakte gefunden (mind. Spalte 'Email' und eine Datenzeile benötigt).")
+    contacts = itertools.chain([first], contacts)
 
     # Signatur bereitstellen
     signature_html = ""
@@ -346,100 +677,138 @@ def main():
         except Exception as e:
             print(f"[WARN] Signatur '{args.sig}' nicht gefunden: {e}", file=sys.stderr)
 
+    # Outlook einmalig verbinden statt pro Mail neu zu dispatchen
+    outlook, outbox = None, None
+    if not args.dry:
+        outlook = connect_outlook()
+        try:
+            outbox = outlook.Session.GetDefaultFolder(OL_FOLDER_OUTBOX)
+        except Exception as e:
+            print(f"[WARN] Postausgang nicht verfügbar – keine Drosselung: {e}", file=sys.stderr)
+        print(f"[DEBUG] Outlook early-bound (gencache)={is_early_bound(outlook)}")
+
     print(
-        f"[INFO] Kontakte: {len(contacts)} | Vorlage: {template_path.name} | "
+        f"[INFO] Kontakte: (streaming) | Vorlage: {template_path.name} | "
         f"Signatur: {'auto' if args.sig.lower()=='auto' else args.sig} | Dry-Run: {args.dry}"
     )
 
     sent, failed = 0, 0
-    for i, c in enumerate(contacts, start=1):
-        email = c.get("email", "")
-        if not email:
-            continue
-
-        # Betreff: pro Zeile 'betreff' > globaler Betreff > Fehler
-        row_subject = c.get("betreff", "").strip()
-        subject = row_subject or global_subject
-        if not subject and args.dry is False:
-            print(
-                f"[SKIP] Kein Betreff für {email} (weder -subject noch Spalte 'Betreff').",
-                file=sys.stderr,
-            )
-            failed += 1
-            continue
-
-        ctx = {
-            "Email": email,
-            "Anrede": c.get("anrede", ""),
-            "Vorname": c.get("vorname", ""),
-            "Nachname": c.get("nachname", ""),
-            "Firma": c.get("firma", ""),
-            "Titel": c.get("titel", ""),
-        }
-        ctx["AnredeBrief"] = build_anrede_brief(
-            ctx["Anrede"], ctx["Titel"], ctx["Vorname"], ctx["Nachname"]
+    throttling = outbox is not None and args.throttle > 0
+    progress = BufferedLog(sys.stdout)
+
+    def warn(msg: str) -> None:
+        progress.flush()  # gepufferte [OK]-Zeilen zuerst, damit die Reihenfolge stimmt
+        print(msg, file=sys.stderr)
+
+    # Cache-Schlüssel: nur die vom Template (inkl. eingebundener Templates) genutzten Variablen;
+    # sind diese nicht vollständig bekannt, der komplette Kontext.
+    render_vars = sorted(tpl_vars - {"signature"}) if tpl_vars_complete else None
+    # LRU: Treffer ans Ende, bei vollem Cache den ältesten Eintrag verwerfen
+    render_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+    render_cache_lock = threading.Lock()  # prepare() läuft in mehreren Render-Threads
+
+    def prepare(c: Dict[str, str]) -> str:
+        ctx = build_context(c)
+        if render_vars is None:
+            key = tuple(sorted(ctx.items()))
+        else:
+            key = tuple((k, ctx[k]) for k in render_vars if k in ctx)
+        # Kontakte mit identischen Template-Werten teilen sich das gerenderte HTML
+        with render_cache_lock:
+            html = render_cache.get(key)
+            if html is not None:
+                render_cache.move_to_end(key)
+                return html
+        # immer mit dem vollständigen Kontext rendern (außerhalb des Locks)
+        html = render_html(
+            tpl, ctx, signature_html=signature_html, inline_signature=inline_signature
         )
-
-        # Weitere Spalten ebenfalls bereitstellen (Originalschlüssel in lowercase)
-        for k, v in c.items():
-            if k.lower() not in {kk.lower() for kk in ctx.keys()}:
-                ctx[k] = v
-
-        # HTML rendern
-        html = render_html(str(template_path), ctx, signature_html=signature_html)
-
-        # CC/BCC/Anhänge
-        cc_raw = c.get("cc", "")
-        bcc_raw = c.get("bcc", "")
-        attach_raw = c.get("anhangpfad", "") or c.get("anhang", "")
-
-        if args.dry:
-            # Im Dry-Run die aufgelösten Anhänge anzeigen
-            if attach_raw:
-                resolved = []
-                for raw in parse_list_field(attach_raw):
-                    resolved += [str(p) for p in _resolve_attachment_candidates(raw, excel_dir)]
-                print(
-                    f"\n--- DRY RUN #{i} ---"
-                    f"\nTO: {email}"
-                    f"\nSUBJECT: {subject or '(leer)'}"
-                    f"\nCC: {cc_raw}"
-                    f"\nBCC: {bcc_raw}"
-                    f"\nANHANG (Roh): {attach_raw}"
-                    f"\nANHANG (gefunden): {resolved if resolved else '—'}"
-                    f"\nHTML (gekürzt):\n{html[:800]}{'…' if len(html)>800 else ''}\n"
-                )
-            else:
-                print(
-                    f"\n--- DRY RUN #{i} ---"
-                    f"\nTO: {email}"
-                    f"\nSUBJECT: {subject or '(leer)'}"
-                    f"\nCC: {cc_raw}"
-                    f"\nBCC: {bcc_raw}"
-                    f"\nANHANG: —"
-                    f"\nHTML (gekürzt):\n{html[:800]}{'…' if len(html)>800 else ''}\n"
-                )
-            continue
-
-        try:
-            send_outlook(
-                to_addr=email,
-                subject=subject,
-                html=html,
-                cc=cc_raw,
-                bcc=bcc_raw,
-                attachments=attach_raw,
-                display=args.display,
-                excel_dir=excel_dir,
-            )
-            sent += 1
-            print(f"[OK] {i}/{len(contacts)} → {email}")
-        except Exception as e:
-            failed += 1
-            print(f"[ERR] {i}/{len(contacts)} → {email}: {e}", file=sys.stderr)
-
-        # sanfte Drosselung
-        time.sleep(args.throttle)
+        with render_cache_lock:
+            render_cache[key] = html
+            render_cache.move_to_end(key)
+            if len(render_cache) > RENDER_CACHE_SIZE:
+                render_cache.popitem(last=False)
+        return html
+
+    # Rendern (reines Python, zustandslos) läuft im Thread-Pool voraus;
+    # Outlook-COM (STA) bleibt im Haupt-Thread.
+    # finally: bereits gesendete Mails auch bei Abbruch (Strg+C, COM-/Render-Fehler) ausgeben
+    try:
+        with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as pool:
+            rendered = render_ahead(pool, contacts, prepare, RENDER_AHEAD)
+            for i, (c, html_future) in enumerate(rendered, start=1):
+                email = c.get("email", "")
+                if not email:
+                    continue
+
+                # Betreff: pro Zeile 'betreff' > globaler Betreff > Fehler
+                row_subject = c.get("betreff", "").strip()
+                subject = row_subject or global_subject
+                if not subject and args.dry is False:
+                    warn(f"[SKIP] Kein Betreff für {email} (weder -subject noch Spalte 'Betreff').")
+                    failed += 1
+                    continue
+
+                # HTML wurde bereits im Hintergrund gerendert
+                html = html_future.result()
+
+                # CC/BCC/Anhänge
+                cc_raw = c.get("cc", "")
+                bcc_raw = c.get("bcc", "")
+                attach_raw = c.get("anhangpfad", "") or c.get("anhang", "")
+
+                if args.dry:
+                    # Im Dry-Run die aufgelösten Anhänge anzeigen
+                    if attach_raw:
+                        resolved = []
+                        for raw in parse_list_field(attach_raw):
+                            resolved += _resolve_attachment_candidates(raw, excel_dir)
+                        print(
+                            f"\n--- DRY RUN #{i} ---"
+                            f"\nTO: {email}"
+                            f"\nSUBJECT: {subject or '(leer)'}"
+                            f"\nCC: {cc_raw}"
+                            f"\nBCC: {bcc_raw}"
+                            f"\nANHANG (Roh): {attach_raw}"
+                            f"\nANHANG (gefunden): {resolved if resolved else '—'}"
+                            f"\nHTML (gekürzt):\n{html[:800]}{'…' if len(html)>800 else ''}\n"
+                        )
+                    else:
+                        print(
+                            f"\n--- DRY RUN #{i} ---"
+                            f"\nTO: {email}"
+                            f"\nSUBJECT: {subject or '(leer)'}"
+                            f"\nCC: {cc_raw}"
+                            f"\nBCC: {bcc_raw}"
+                            f"\nANHANG: —"
+                            f"\nHTML (gekürzt):\n{html[:800]}{'…' if len(html)>800 else ''}\n"
+                        )
+                    continue
+
+                try:
+                    send_outlook(
+                        outlook,
+                        to_addr=email,
+                        subject=subject,
+                        html=html,
+                        cc=cc_raw,
+                        bcc=bcc_raw,
+                        attachments=attach_raw,
+                        display=args.display,
+                        excel_dir=excel_dir,
+                        warnf=warn,
+                    )
+                    sent += 1
+                    progress.write(f"[OK] #{i} → {email}")
+                except Exception as e:
+                    failed += 1
+                    warn(f"[ERR] #{i} → {email}: {e}")
+
+                # sanfte Drosselung (nur bei vollem Postausgang)
+                if throttling:
+                    throttling = wait_for_outbox(outbox, args.outbox, args.throttle, warnf=warn)
+    finally:
+        progress.flush()
 
     if not args.dry:
         print(f"\nFertig. Gesendet: {sent}, Fehler: {failed}")